@@ -24,7 +24,7 @@ Data details
 - Parses segments & points (with timestamps, alt, gs, track, etc.).
 - Builds:
     * KML: static per-segment LineStrings + per-point TimeStamp placemarks
-      with ExtendedData including:
+      (zipped as .kmz for large tracks) with ExtendedData including:
         - core hit fields
         - meta_* fields (reg, owner, type, type_name, etc.)
         - one attribute per AC data key (type, flight, squawk, category, nic, ...).
@@ -37,23 +37,46 @@ Data details
 
 Requirements
 ------------
-    pip install PyQt5 requests simplekml
+    pip install PyQt5 requests
+
+Optional (faster, lower-memory parsing and export of large traces):
+    pip install ijson orjson
 """
 
 import os
+import re
 import sys
 import json
+import mmap
 import gzip
 import io
 import time
 import csv
+import itertools
+import sqlite3
 import subprocess
+import threading
+import zipfile
 import datetime as dt
-from dataclasses import dataclass
-from typing import List, Dict, Any, Iterable, Optional, Set
+from contextlib import closing, contextmanager, suppress
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Callable, List, Dict, Any, Iterable, Iterator, Optional, Set, Tuple
+from xml.sax.saxutils import escape, quoteattr
 
 import requests
-import simplekml
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:  # optional: stream-parse large trace files row by row
+    import ijson
+except ImportError:
+    ijson = None
+
+try:  # optional: much faster JSON serialization for exports
+    import orjson
+except ImportError:
+    orjson = None
 
 from PyQt5 import QtCore, QtGui, QtWidgets
 
@@ -61,11 +84,15 @@ from PyQt5 import QtCore, QtGui, QtWidgets
 # ADSBx constants & helpers
 # -----------------------------
 
+_HEX_RE = re.compile(r"[0-9A-F]{6}")  # ICAO 24-bit address, uppercase
+
 HEADERS = {
     "Referer": "https://globe.adsbexchange.com/",
     "User-Agent": "adsbx-history-downloader-gui/pyqt/2.0",
 }
 
+GZIP_HEADERS = {**HEADERS, "Accept-Encoding": "gzip"}
+
 BASE = (
     "https://globe.adsbexchange.com/globe_history/{y}/{m:02d}/{d:02d}/"
     "traces/{suffix}/trace_full_{hex}.json"
@@ -73,6 +100,24 @@ BASE = (
 
 AC_DB_URL = "http://downloads.adsbexchange.com/downloads/basic-ac-db.json.gz"
 _ACDB_CACHE = None  # in-memory cache of ADSBx aircraft DB
+_ACDB_INDEX: Optional[Dict[str, dict]] = None  # hex → record, built once on load
+
+FETCH_WORKERS = 8          # parallel per-day trace downloads
+FETCH_RATE_PER_SEC = 4.0   # global request budget towards ADSBx (all workers)
+
+TRACE_REVALIDATE_DAYS = 2  # cached traces this recent (UTC, incl. today) are re-checked
+
+TRACE_STREAM_MIN_BYTES = 8 << 20  # traces this big (as JSON, uncompressed) are streamed, not parsed whole
+
+PARSED_CACHE_VERSION = 1  # bump whenever the hit/segment layout from iter_hits changes
+
+LOG_FLUSH_MS = 100  # how often buffered Worker log lines reach the UI
+
+KMZ_MIN_POINTS = 20000  # larger tracks are exported as zipped .kmz instead of .kml
+
+METADATA_TTL = 7 * 24 * 3600  # seconds an on-disk OpenSky/Planespotters answer stays fresh
+# (source, hex, cache_dir) → (fetch time, API answer); entries expire after METADATA_TTL too
+_METADATA_MEMO: Dict[Tuple[str, str, Optional[str]], Tuple[float, Any]] = {}
 
 # ICAO aircraft type designator → common name
 ICAO_TYPE_NAMES = {
@@ -129,6 +174,64 @@ ICAO_TYPE_NAMES = {
     # Extend as needed.
 }
 
+# Lookup table for apply_type_mapping, keyed by normalized (stripped,
+# uppercase) code so entries added above in any case still match
+_TYPE_NAMES_BY_CODE: Dict[str, str] = {
+    code.strip().upper(): name for code, name in ICAO_TYPE_NAMES.items()
+}
+
+
+def json_dumps(obj: Any) -> str:
+    """Compact JSON text for embedding in CSV/KML fields (orjson if available)."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+_EPOCH_DATE = dt.date(1970, 1, 1)
+_DAY_PREFIX: Dict[int, str] = {}  # days since epoch → "YYYY-MM-DDT"
+_HHMM = [f"{h:02d}:{m:02d}:" for h in range(24) for m in range(60)]  # minute of day
+_SS = [f"{s:02d}" for s in range(60)]
+
+
+def iso_utc(ts: float) -> Optional[str]:
+    """
+    datetime.utcfromtimestamp(ts).isoformat() + "Z", without building a
+    datetime per call: the date part comes from a per-day cache (trace points
+    of one day share it) and the time of day from lookup tables.
+    Returns None for out-of-range timestamps.
+    """
+    try:
+        if ts.__class__ is int:
+            secs, us = ts, 0
+        else:
+            # Same rounding as utcfromtimestamp (half-even to microseconds)
+            secs = int(ts)
+            us = round((ts - secs) * 1e6)
+            if us >= 1000000:
+                secs += 1
+                us -= 1000000
+            elif us < 0:
+                secs -= 1
+                us += 1000000
+        day, sod = divmod(secs, 86400)
+        prefix = _DAY_PREFIX.get(day)
+        if prefix is None:
+            prefix = _DAY_PREFIX[day] = (_EPOCH_DATE + dt.timedelta(days=day)).isoformat() + "T"
+    except (OverflowError, ValueError):
+        return None
+    minute, sec = divmod(sod, 60)
+    if us:
+        return f"{prefix}{_HHMM[minute]}{_SS[sec]}.{us:06d}Z"
+    return f"{prefix}{_HHMM[minute]}{_SS[sec]}Z"
+
+
+def json_loads(data: Any) -> Any:
+    """Parse JSON from bytes or str (orjson if available, no str round-trip)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 def daterange(start: dt.date, end: dt.date) -> Iterable[dt.date]:
     """Inclusive date range."""
@@ -139,103 +242,80 @@ def daterange(start: dt.date, end: dt.date) -> Iterable[dt.date]:
         cur += one
 
 
-def extract_hits(blob: Any) -> List[List[Dict[str, Any]]]:
-    """
-    Extract per-hit dictionaries from various ADSBx trace formats.
+# None padding that brings a short trace row up to the 9 fields iter_hits reads
+_ROW_PAD = [[None] * (9 - n) for n in range(9)]
 
-    Returns:
-        list of segments; each segment is a list of hits.
 
-    Each hit dict may contain:
-        - timestamp (unix, seconds)
-        - time_iso (ISO 8601 UTC string)
-        - lat, lon
-        - alt_ft, gs_knots, track_deg, flags, vrt_fpm
-        - ac_data (nested ADS-B data dict, if present)
+def iter_hits(rows: Iterable[Any], base_ts: Any = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
     """
-    base_ts = None
-    if isinstance(blob, dict):
-        base_ts = blob.get("timestamp")
-        seq = blob.get("trace") or blob.get("positions") or blob.get("trail")
-    else:
-        seq = blob
-    segments: List[List[Dict[str, Any]]] = []
-    current: List[Dict[str, Any]] = []
+    Decode trace rows into hit dicts (see extract_hits for the hit layout).
 
-    if not isinstance(seq, list):
-        return segments
-
-    def flush_segment():
-        nonlocal current
-        if current:
-            segments.append(current)
-            current = []
+    Yields (segment_index, hit) pairs. segment_index starts at 1 and advances
+    whenever a row starts a new leg (flags bit 2) after at least one valid hit.
+    Works on any iterable of rows, so it can consume a streaming parser.
+    """
+    seg_idx = 1
+    seg_len = 0
 
-    for row in seq:
-        lat = lon = None
-        hit: Dict[str, Any] = {}
+    # Loop invariants, hoisted out of the per-row path
+    num = (int, float)
+    has_base_ts = isinstance(base_ts, num)
 
+    for row in rows:
         if isinstance(row, list) and len(row) >= 3:
             # v2 trace_full format: [dt, lat, lon, alt, gs, track, flags, vrt, ac_data, ...]
-            dt_offset = row[0] if len(row) >= 1 else None
+            n = len(row)
+            if n < 9:
+                # Pad short rows once so every field below is a plain index
+                row = row + _ROW_PAD[n]
+            flags = row[6]
+
+            # New leg detection: flags bit 2 (per ADSBx docs)
+            if isinstance(flags, int) and (flags & 2) and seg_len:
+                seg_idx += 1
+                seg_len = 0
+
             lat = row[1]
             lon = row[2]
-            alt_ft = row[3] if len(row) >= 4 else None
-            gs_knots = row[4] if len(row) >= 5 else None
-            track_deg = row[5] if len(row) >= 6 else None
-            flags = row[6] if len(row) >= 7 else None
-            vrt_fpm = row[7] if len(row) >= 8 else None
-            ac_data = row[8] if len(row) >= 9 and isinstance(row[8], dict) else None
+            if not isinstance(lat, num) or not isinstance(lon, num):
+                continue
 
+            dt_offset = row[0]
             ts = None
-            if isinstance(base_ts, (int, float)) and isinstance(dt_offset, (int, float)):
+            if has_base_ts and isinstance(dt_offset, num):
                 ts = base_ts + dt_offset
 
-            time_iso = None
-            if isinstance(ts, (int, float)):
-                try:
-                    time_iso = dt.datetime.utcfromtimestamp(ts).isoformat() + "Z"
-                except (OverflowError, OSError):
-                    time_iso = None
-
-            hit.update(
-                {
-                    "timestamp": ts,
-                    "time_iso": time_iso,
-                    "lat": lat,
-                    "lon": lon,
-                    "alt_ft": alt_ft,
-                    "gs_knots": gs_knots,
-                    "track_deg": track_deg,
-                    "flags": flags,
-                    "vrt_fpm": vrt_fpm,
-                }
-            )
-            if ac_data is not None:
+            time_iso = iso_utc(ts) if ts is not None else None
+
+            # Build the hit in one go; rows that fail validation never get here
+            hit: Dict[str, Any] = {
+                "timestamp": ts,
+                "time_iso": time_iso,
+                "lat": lat,
+                "lon": lon,
+                "alt_ft": row[3],
+                "gs_knots": row[4],
+                "track_deg": row[5],
+                "flags": flags,
+                "vrt_fpm": row[7],
+            }
+            ac_data = row[8]
+            if isinstance(ac_data, dict):
                 hit["ac_data"] = ac_data
 
-            # New leg detection: flags bit 2 (per ADSBx docs)
-            if isinstance(flags, int) and (flags & 2):
-                flush_segment()
-
         elif isinstance(row, dict):
             lat = row.get("lat")
             lon = row.get("lon") or row.get("lng")
+            if not isinstance(lat, num) or not isinstance(lon, num):
+                continue
             ts = row.get("time") or row.get("ts") or row.get("timestamp")
-            time_iso = None
-            if isinstance(ts, (int, float)):
-                try:
-                    time_iso = dt.datetime.utcfromtimestamp(ts).isoformat() + "Z"
-                except (OverflowError, OSError):
-                    time_iso = None
-            hit.update(
-                {
-                    "timestamp": ts,
-                    "time_iso": time_iso,
-                    "lat": lat,
-                    "lon": lon,
-                }
-            )
+            time_iso = iso_utc(ts) if isinstance(ts, num) else None
+            hit = {
+                "timestamp": ts,
+                "time_iso": time_iso,
+                "lat": lat,
+                "lon": lon,
+            }
             # Copy some common extras if present
             for key in (
                 "alt",
@@ -254,26 +334,312 @@ def extract_hits(blob: Any) -> List[List[Dict[str, Any]]]:
         else:
             continue
 
-        if not isinstance(lat, (int, float)) or not isinstance(lon, (int, float)):
-            continue
+        seg_len += 1
+        yield seg_idx, hit
 
-        current.append(hit)
 
-    flush_segment()
+def group_segments(pairs: Iterable[Tuple[int, Dict[str, Any]]]) -> List[List[Dict[str, Any]]]:
+    """Collect (segment_index, hit) pairs from iter_hits into a list of segments."""
+    segments: List[List[Dict[str, Any]]] = []
+    last_idx = None
+    for seg_idx, hit in pairs:
+        if seg_idx != last_idx:
+            segments.append([])
+            last_idx = seg_idx
+        segments[-1].append(hit)
     return segments
 
 
+def extract_hits(blob: Any) -> List[List[Dict[str, Any]]]:
+    """
+    Extract per-hit dictionaries from various ADSBx trace formats.
+
+    Returns:
+        list of segments; each segment is a list of hits.
+
+    Each hit dict may contain:
+        - timestamp (unix, seconds)
+        - time_iso (ISO 8601 UTC string)
+        - lat, lon
+        - alt_ft, gs_knots, track_deg, flags, vrt_fpm
+        - ac_data (nested ADS-B data dict, if present)
+    """
+    base_ts = None
+    if isinstance(blob, dict):
+        base_ts = blob.get("timestamp")
+        seq = blob.get("trace") or blob.get("positions") or blob.get("trail")
+    else:
+        seq = blob
+
+    if not isinstance(seq, list):
+        return []
+
+    return group_segments(iter_hits(seq, base_ts))
+
+
+def _open_trace(path: str):
+    """Open a cached trace (or DB) file for binary reading, gunzipping if needed."""
+    with open(path, "rb") as f:
+        magic = f.read(2)
+    if magic == b"\x1f\x8b":
+        return gzip.open(path, "rb")
+    return open(path, "rb")
+
+
+def read_trace_header(path: str) -> Tuple[Dict[str, Any], bool]:
+    """
+    Stream the top-level scalar fields (timestamp, r, t, desc, dbFlags, ...)
+    that precede the "trace" array, without parsing the array itself.
+
+    Returns (header, streamable); streamable is False when the file is not a
+    JSON object with a "trace" array, or when its "timestamp" (the base
+    time of every row) does not come before that array. Callers should then
+    fall back to a full parse. Requires ijson.
+    """
+    header: Dict[str, Any] = {}
+    with _open_trace(path) as fp:
+        for prefix, event, value in ijson.parse(fp, use_float=True):
+            if not prefix:
+                if event not in ("start_map", "map_key"):
+                    return header, False
+                continue
+            if prefix == "trace":
+                return header, event == "start_array" and "timestamp" in header
+            if "." not in prefix and event in ("string", "number", "boolean", "null"):
+                header[prefix] = value
+    return header, False
+
+
+def iter_hits_streaming(
+    path: str, header: Optional[Dict[str, Any]] = None
+) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Like iter_hits, but reads rows from a trace_full file one at a time with
+    ijson instead of materializing the whole document. Requires ijson.
+    """
+    if header is None:
+        header, _ = read_trace_header(path)
+    with _open_trace(path) as fp:
+        rows = ijson.items(fp, "trace.item", use_float=True)
+        yield from iter_hits(rows, header.get("timestamp"))
+
+
+def load_trace_blob(path: str) -> Any:
+    """Fully parse a cached trace file (plain or gzipped JSON)."""
+    with open(path, "rb") as f:
+        magic = f.read(2)
+        f.seek(0)
+        if magic == b"\x1f\x8b":
+            return json_loads(gzip.decompress(f.read()))  # one-shot inflate
+        if orjson is not None and magic:
+            # Plain JSON: let orjson read the page cache directly instead of
+            # copying the whole file into a bytes object first
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    return orjson.loads(view)
+        return json.loads(f.read())
+
+
+def trace_json_size(path: str) -> int:
+    """
+    Uncompressed size of a cached trace file: for gzipped files the ISIZE
+    field of the gzip trailer (size mod 2**32, exact below 4 GiB), for
+    plain ones the file size.
+    """
+    with open(path, "rb") as f:
+        if f.read(2) != b"\x1f\x8b":
+            return os.fstat(f.fileno()).st_size
+        f.seek(-4, os.SEEK_END)
+        return int.from_bytes(f.read(4), "little")
+
+
+def load_trace_day(path: str) -> Tuple[Dict[str, Any], List[List[Dict[str, Any]]]]:
+    """
+    Parse one cached trace file into (header, segments).
+
+    header holds the top-level scalar fields of the trace (suitable for
+    merge_trace_blob_into_meta). With orjson installed the whole file is
+    parsed at once (fastest; the hits built from it dominate memory anyway),
+    except for traces of TRACE_STREAM_MIN_BYTES or more of JSON (see
+    trace_json_size). Those, and every file when orjson is missing, are
+    streamed with ijson when it is installed, falling back to a full parse
+    with the stdlib json module.
+    """
+    if ijson is not None and (orjson is None or trace_json_size(path) >= TRACE_STREAM_MIN_BYTES):
+        header, streamable = read_trace_header(path)
+        if streamable:
+            return header, group_segments(iter_hits_streaming(path, header))
+
+    blob = load_trace_blob(path)
+    header = {}
+    if isinstance(blob, dict):
+        header = {k: v for k, v in blob.items() if not isinstance(v, (list, dict))}
+    return header, extract_hits(blob)
+
+
+def parsed_cache_path(path: str) -> str:
+    """Where load_trace_day_cached keeps the parsed form of a trace file."""
+    return path + ".parsed.json"
+
+
+def has_fresh_parsed_cache(path: str) -> bool:
+    """True if the parsed cache of a trace file exists and is not older than it."""
+    try:
+        return os.path.getmtime(parsed_cache_path(path)) >= os.path.getmtime(path)
+    except OSError:
+        return False
+
+
+def load_trace_day_cached(path: str) -> Tuple[Dict[str, Any], List[List[Dict[str, Any]]]]:
+    """
+    load_trace_day, with the result kept next to the trace file
+    (parsed_cache_path). Later runs load that instead of decoding the raw
+    trace again, as long as it is newer than the trace and was written
+    with the current PARSED_CACHE_VERSION. Cache write errors are ignored.
+
+    The cache lives in the user-chosen output folder, so it is plain JSON
+    rather than a pickle: loading it cannot run code. Its contents are
+    still trusted input (used as hits without further validation).
+    """
+    parsed_path = parsed_cache_path(path)
+    try:
+        if has_fresh_parsed_cache(path):
+            with open(parsed_path, "rb") as f:
+                version, header, segments = json_loads(f.read())
+            if version == PARSED_CACHE_VERSION:
+                return header, segments
+    except Exception:
+        pass  # missing, stale or unreadable: parse the trace
+
+    header, segments = load_trace_day(path)
+    try:
+        tmp_path = parsed_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(json_dumps([PARSED_CACHE_VERSION, header, segments]))
+        os.replace(tmp_path, parsed_path)
+    except OSError:
+        pass
+    return header, segments
+
+
 def ensure_dir_for_file(path: str) -> None:
     directory = os.path.dirname(os.path.abspath(path))
     if directory:
         os.makedirs(directory, exist_ok=True)
 
 
+def _kml_data(name: str, value: Any) -> str:
+    """One ExtendedData <Data> element."""
+    return f"<Data name={quoteattr(name)}><value>{escape(str(value))}</value></Data>"
+
+
+class KmlStreamWriter:
+    """
+    Writes a KML document element by element to an open text file, instead
+    of building a simplekml object tree and serializing it all at the end.
+    Callers pass plain strings; escaping is done here (except for the
+    pre-rendered ExtendedData fragments, see _kml_data).
+    """
+
+    def __init__(self, f):
+        self._write = f.write
+
+    def begin(self) -> None:
+        self._write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<kml xmlns="http://www.opengis.net/kml/2.2" '
+            'xmlns:gx="http://www.google.com/kml/ext/2.2">\n'
+            "<Document>\n"
+        )
+
+    def end(self) -> None:
+        self._write("</Document>\n</kml>\n")
+
+    def open_folder(self, name: str, description: Optional[str] = None) -> None:
+        self._write(f"<Folder><name>{escape(name)}</name>")
+        if description:
+            self._write(f"<description>{escape(description)}</description>")
+        self._write("\n")
+
+    def close_folder(self) -> None:
+        self._write("</Folder>\n")
+
+    def placemark(self, name: str, description: Optional[str] = None) -> None:
+        """Placemark without geometry."""
+        self._write(f"<Placemark><name>{escape(name)}</name>")
+        if description:
+            self._write(f"<description>{escape(description)}</description>")
+        self._write("</Placemark>\n")
+
+    def line(self, name: str, coords: List[tuple]) -> None:
+        """Ground-clamped, tessellated LineString placemark; coords are (lon, lat)."""
+        coord_text = " ".join(f"{lon!r},{lat!r}" for lon, lat in coords)
+        self._write(
+            f"<Placemark><name>{escape(name)}</name><LineString>"
+            "<extrude>0</extrude><tessellate>1</tessellate>"
+            "<altitudeMode>clampToGround</altitudeMode>"
+            f"<coordinates>{coord_text}</coordinates></LineString></Placemark>\n"
+        )
+
+    def point(
+        self,
+        name: str,
+        lon: float,
+        lat: float,
+        description: Optional[str] = None,
+        when: Optional[str] = None,
+        extended_data: str = "",
+    ) -> None:
+        """Point placemark; extended_data is a string of <Data> elements."""
+        parts = [f"<Placemark><name>{escape(name)}</name>"]
+        if description:
+            parts.append(f"<description>{escape(description)}</description>")
+        if when:
+            parts.append(f"<TimeStamp><when>{escape(when)}</when></TimeStamp>")
+        if extended_data:
+            parts.append(f"<ExtendedData>{extended_data}</ExtendedData>")
+        parts.append(f"<Point><coordinates>{lon!r},{lat!r}</coordinates></Point></Placemark>\n")
+        self._write("".join(parts))
+
+
+def discover_ac_keys(segments: List[List[Dict[str, Any]]]) -> List[str]:
+    """
+    Sorted union of the ac_data keys across all hits. KML and CSV exports
+    both need it; the Worker computes it once and passes it to each builder.
+    """
+    # set.update keeps the scan in C; the result is sorted anyway, so
+    # first-seen order is not tracked
+    ac_key_set: Set[str] = set()
+    for seg in segments:
+        for hit in seg:
+            ac = hit.get("ac_data")
+            if isinstance(ac, dict):
+                ac_key_set.update(ac)
+    return sorted(ac_key_set)
+
+
+@contextmanager
+def open_kml_output(out_path: str):
+    """
+    Text file for KmlStreamWriter. A ".kmz" path gets a zip archive whose
+    doc.kml is compressed as it is written; anything else a plain file.
+    """
+    if out_path.lower().endswith(".kmz"):
+        with zipfile.ZipFile(out_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            with zf.open("doc.kml", "w", force_zip64=True) as raw:
+                with io.TextIOWrapper(raw, encoding="utf-8") as f:
+                    yield f
+    else:
+        with open(out_path, "w", encoding="utf-8", buffering=1 << 20) as f:
+            yield f
+
+
 def build_kml(
     segments: List[List[Dict[str, Any]]],
     hex_code: str,
     meta: Dict[str, Any],
     out_path: str,
+    ac_keys: Optional[List[str]] = None,
 ) -> None:
     """
     Build a time-enabled KML:
@@ -283,135 +649,116 @@ def build_kml(
     - ExtendedData includes:
         * core hit fields (time, alt, speed, etc.)
         * aircraft meta (reg, owner, type, type_name, description)
-        * one field per unique key in ac_data across all hits.
+        * one field per unique key in ac_data across all hits
+          (ac_keys, from discover_ac_keys if not given).
+
+    The document is streamed to out_path with KmlStreamWriter; an out_path
+    ending in ".kmz" is written as a zipped KMZ (see open_kml_output).
     """
-    # Discover all ac_data keys across all segments
-    ac_keys: List[str] = []
-    ac_key_set = set()
-    for seg in segments:
-        for hit in seg:
-            ac = hit.get("ac_data")
-            if isinstance(ac, dict):
-                for k in ac.keys():
-                    if k not in ac_key_set:
-                        ac_key_set.add(k)
-                        ac_keys.append(k)
-    ac_keys = sorted(ac_keys)
+    if ac_keys is None:
+        ac_keys = discover_ac_keys(segments)
 
-    kml = simplekml.Kml()
     root_name = f"ADSBx {hex_code.upper()} Track"
-    fol = kml.newfolder(name=root_name)
 
     # Folder description with basic meta
     meta_lines = [f"ICAO: {hex_code.upper()}"]
     for k in ("registration", "type", "type_name", "owner", "description"):
         if meta.get(k):
             meta_lines.append(f"{k.capitalize()}: {meta[k]}")
-    fol.description = "\n".join(meta_lines)
 
-    total_points = 0
-
-    # Static route lines
-    for i, seg in enumerate(segments, 1):
-        coords = []
-        for hit in seg:
-            try:
-                lat = float(hit.get("lat"))
-                lon = float(hit.get("lon"))
-            except (TypeError, ValueError):
-                continue
-            coords.append((lon, lat))
-        if len(coords) >= 2:
-            ls = fol.newlinestring(name=f"Segment {i}")
-            ls.coords = coords
-            ls.altitudemode = simplekml.AltitudeMode.clamptoground
-            ls.extrude = 0
-            ls.tessellate = 1
-        total_points += len(coords)
-
-    # Per-hit points (time-enabled)
-    pts_folder = fol.newfolder(name="Points")
-    for seg_idx, seg in enumerate(segments, 1):
-        for pt_idx, hit in enumerate(seg, 1):
-            try:
-                lat = float(hit.get("lat"))
-                lon = float(hit.get("lon"))
-            except (TypeError, ValueError):
-                continue
-
-            time_iso = hit.get("time_iso")
-            name = time_iso or f"Seg {seg_idx} Pt {pt_idx}"
+    # Meta description lines and ExtendedData are the same on every point:
+    # build them once
+    meta_desc_lines = [
+        f"{k}: {meta[k]}"
+        for k in ("registration", "type", "type_name", "owner", "description")
+        if meta.get(k)
+    ]
+    meta_ext = "".join(
+        _kml_data(f"meta_{mk}", mv) for mk, mv in meta.items() if mv is not None
+    )
 
-            try:
-                p = pts_folder.newpoint(name=name, coords=[(lon, lat)])
-            except Exception:
-                continue
+    total_points = 0
 
-            # TimeStamp for GE time slider
-            if time_iso:
+    ensure_dir_for_file(out_path)
+    with open_kml_output(out_path) as f:
+        kml = KmlStreamWriter(f)
+        kml.begin()
+        kml.open_folder(root_name, "\n".join(meta_lines))
+
+        # Static route lines
+        for i, seg in enumerate(segments, 1):
+            coords = []
+            for hit in seg:
                 try:
-                    p.timestamp.when = time_iso
-                except Exception:
-                    pass
-
-            # Description
-            desc_lines = [
-                f"Segment: {seg_idx}",
-                f"Index: {pt_idx}",
-            ]
-            for key in ("time_iso", "alt_ft", "gs_knots", "track_deg", "vrt_fpm", "flags"):
-                val = hit.get(key)
-                if val is not None:
-                    desc_lines.append(f"{key}: {val}")
-
-            # Basic meta
-            for key in ("registration", "type", "type_name", "owner", "description"):
-                if meta.get(key):
-                    desc_lines.append(f"{key}: {meta[key]}")
-
-            ac_data = hit.get("ac_data")
-            if isinstance(ac_data, dict) and ac_data:
-                desc_lines.append("AC data: " + json.dumps(ac_data, ensure_ascii=False))
-
-            p.description = "\n".join(desc_lines)
-
-            # ExtendedData: core hit fields
-            for key, val in hit.items():
-                if key == "ac_data":
+                    lat = float(hit.get("lat"))
+                    lon = float(hit.get("lon"))
+                except (TypeError, ValueError):
                     continue
-                if val is not None:
-                    try:
-                        p.extendeddata.simplenode(key, str(val))
-                    except Exception:
-                        continue
-
-            # ExtendedData: aircraft meta
-            for mk, mv in meta.items():
-                if mv is not None:
-                    try:
-                        p.extendeddata.simplenode(f"meta_{mk}", str(mv))
-                    except Exception:
-                        continue
-
-            # ExtendedData: AC data fields as their own attributes
-            ac = ac_data if isinstance(ac_data, dict) else {}
-            for ak in ac_keys:
+                coords.append((lon, lat))
+            if len(coords) >= 2:
+                kml.line(f"Segment {i}", coords)
+            total_points += len(coords)
+
+        # Per-hit points (time-enabled)
+        kml.open_folder("Points")
+        for seg_idx, seg in enumerate(segments, 1):
+            for pt_idx, hit in enumerate(seg, 1):
                 try:
+                    lat = float(hit.get("lat"))
+                    lon = float(hit.get("lon"))
+                except (TypeError, ValueError):
+                    continue
+
+                time_iso = hit.get("time_iso")
+                name = time_iso or f"Seg {seg_idx} Pt {pt_idx}"
+
+                # Description
+                desc_lines = [
+                    f"Segment: {seg_idx}",
+                    f"Index: {pt_idx}",
+                ]
+                for key in ("time_iso", "alt_ft", "gs_knots", "track_deg", "vrt_fpm", "flags"):
+                    val = hit.get(key)
+                    if val is not None:
+                        desc_lines.append(f"{key}: {val}")
+
+                # Basic meta
+                desc_lines.extend(meta_desc_lines)
+
+                ac_data = hit.get("ac_data")
+                if isinstance(ac_data, dict) and ac_data:
+                    desc_lines.append("AC data: " + json_dumps(ac_data))
+
+                # ExtendedData: core hit fields, aircraft meta, AC data fields
+                ext = [
+                    _kml_data(key, val)
+                    for key, val in hit.items()
+                    if key != "ac_data" and val is not None
+                ]
+                ext.append(meta_ext)
+                ac = ac_data if isinstance(ac_data, dict) else {}
+                for ak in ac_keys:
                     v = ac.get(ak, "")
                     if isinstance(v, (dict, list)):
-                        v = json.dumps(v, ensure_ascii=False)
-                    p.extendeddata.simplenode(ak, str(v))
-                except Exception:
-                    continue
+                        v = json_dumps(v)
+                    ext.append(_kml_data(ak, v))
 
-            total_points += 1
+                kml.point(
+                    name,
+                    lon,
+                    lat,
+                    description="\n".join(desc_lines),
+                    when=time_iso,
+                    extended_data="".join(ext),
+                )
+                total_points += 1
+        kml.close_folder()
 
-    if total_points == 0:
-        empty = fol.newpoint(name="No valid points", coords=[])
-        empty.description = "No valid coordinates found in trace."
+        if total_points == 0:
+            kml.placemark("No valid points", "No valid coordinates found in trace.")
 
-    ensure_dir_for_file(out_path)
-    kml.save(out_path)
+        kml.close_folder()
+        kml.end()
 
 
 def build_csv(
@@ -419,6 +766,7 @@ def build_csv(
     hex_code: str,
     meta: Dict[str, Any],
     out_path: str,
+    ac_keys: Optional[List[str]] = None,
 ) -> None:
     """
     Build CSV with per-point entries.
@@ -428,25 +776,16 @@ def build_csv(
         latitude, longitude, alt_ft, gs_knots, track_deg, vrt_fpm, flags,
         registration, type, type_name, owner, description,
     Then:
-        one column per unique key in ac_data
+        one column per unique key in ac_data (ac_keys, from
+        discover_ac_keys if not given)
     Finally:
         ac_data_json
     """
-    # Discover all ac_data keys
-    ac_keys: List[str] = []
-    ac_key_set = set()
-    for seg in segments:
-        for hit in seg:
-            ac = hit.get("ac_data")
-            if isinstance(ac, dict):
-                for k in ac.keys():
-                    if k not in ac_key_set:
-                        ac_key_set.add(k)
-                        ac_keys.append(k)
-    ac_keys = sorted(ac_keys)
+    if ac_keys is None:
+        ac_keys = discover_ac_keys(segments)
 
     ensure_dir_for_file(out_path)
-    with open(out_path, "w", newline="", encoding="utf-8") as f:
+    with open(out_path, "w", newline="", encoding="utf-8", buffering=1 << 20) as f:
         writer = csv.writer(f)
 
         base_header = [
@@ -471,54 +810,54 @@ def build_csv(
         header = base_header + ac_keys + ["ac_data_json"]
         writer.writerow(header)
 
-        reg = meta.get("registration")
-        atype = meta.get("type")
-        tname = meta.get("type_name")
-        owner = meta.get("owner")
-        desc = meta.get("description")
+        # Cells that are the same on every row are built once
+        hex_upper = hex_code.upper()
+        meta_cells = [
+            meta.get(k) or ""
+            for k in ("registration", "type", "type_name", "owner", "description")
+        ]
+        no_ac_cells = [""] * len(ac_keys) + [""]  # AC columns + ac_data_json
+        writerow = writer.writerow
 
         for seg_idx, seg in enumerate(segments, 1):
             for pt_idx, hit in enumerate(seg, 1):
+                get = hit.get
                 try:
-                    lat = float(hit.get("lat"))
-                    lon = float(hit.get("lon"))
+                    lat = float(get("lat"))
+                    lon = float(get("lon"))
                 except (TypeError, ValueError):
                     continue
 
-                ac_data = hit.get("ac_data")
-                if not isinstance(ac_data, dict):
-                    ac_data = {}
-
-                ac_json = json.dumps(ac_data, ensure_ascii=False) if ac_data else ""
+                ac_data = get("ac_data")
+                if isinstance(ac_data, dict) and ac_data:
+                    ac_cells = []
+                    for k in ac_keys:
+                        v = ac_data.get(k, "")
+                        if isinstance(v, (dict, list)):
+                            v = json_dumps(v)
+                        ac_cells.append(v)
+                    ac_cells.append(json_dumps(ac_data))
+                else:
+                    ac_cells = no_ac_cells
 
+                ts = get("timestamp")
                 row = [
-                    hex_code.upper(),
+                    hex_upper,
                     seg_idx,
                     pt_idx,
-                    hit.get("timestamp") if hit.get("timestamp") is not None else "",
-                    hit.get("time_iso") or "",
+                    ts if ts is not None else "",
+                    get("time_iso") or "",
                     lat,
                     lon,
-                    hit.get("alt_ft", ""),
-                    hit.get("gs_knots", ""),
-                    hit.get("track_deg", ""),
-                    hit.get("vrt_fpm", ""),
-                    hit.get("flags", ""),
-                    reg or "",
-                    atype or "",
-                    tname or "",
-                    owner or "",
-                    desc or "",
+                    get("alt_ft", ""),
+                    get("gs_knots", ""),
+                    get("track_deg", ""),
+                    get("vrt_fpm", ""),
+                    get("flags", ""),
                 ]
-
-                for k in ac_keys:
-                    v = ac_data.get(k, "")
-                    if isinstance(v, (dict, list)):
-                        v = json.dumps(v, ensure_ascii=False)
-                    row.append(v)
-
-                row.append(ac_json)
-                writer.writerow(row)
+                row += meta_cells
+                row += ac_cells
+                writerow(row)
 
 
 def build_json(
@@ -550,10 +889,242 @@ def build_json(
             {"segment": i, "points": seg} for i, seg in enumerate(segments, 1)
         ],
     }
+    if orjson is not None:
+        with open(out_path, "wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
     with open(out_path, "w", encoding="utf-8") as f:
         json.dump(data, f, indent=2, ensure_ascii=False)
 
 
+def sleep_unless_stopped(seconds: float, stop: Optional[threading.Event] = None) -> bool:
+    """time.sleep that wakes up as soon as stop is set. Returns True if stopped."""
+    if stop is None:
+        time.sleep(seconds)
+        return False
+    return stop.wait(seconds)
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket shared by all download workers.
+
+    acquire() blocks until the caller may send its next request; pause()
+    pushes the next free slot out for *every* worker (used on HTTP 429).
+    """
+
+    def __init__(self, rate_per_sec: float):
+        self.interval = 1.0 / rate_per_sec
+        self._lock = threading.Lock()
+        self._next_slot = time.monotonic()
+
+    def acquire(self, stop: Optional[threading.Event] = None) -> None:
+        """Wait for the next slot; returns early once stop is set."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            sleep_unless_stopped(delay, stop)
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self._next_slot = max(self._next_slot, time.monotonic() + seconds)
+
+
+def make_session(retries: int = 0) -> requests.Session:
+    """
+    requests.Session with a keep-alive connection pool. retries > 0 adds
+    automatic retries with backoff on connection errors and 429/5xx answers
+    (for the metadata/photo APIs; trace downloads do their own retrying
+    under the shared RateLimiter).
+    """
+    session = requests.Session()
+    max_retries = 0
+    if retries:
+        max_retries = Retry(
+            total=retries,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            raise_on_status=False,  # hand back the last answer, callers check status
+        )
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=max_retries)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class ThreadSessions:
+    """
+    One Session per thread (from factory, make_session by default), created
+    on first use. Download workers get their own Session (and cookie jar)
+    instead of sharing one across simultaneous requests; close() closes
+    them all.
+    """
+
+    def __init__(self, factory: Callable[[], requests.Session] = make_session):
+        self._factory = factory
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._sessions: List[requests.Session] = []
+
+    def get(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = self._factory()
+            with self._lock:
+                self._sessions.append(session)
+        return session
+
+    def close(self) -> None:
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            session.close()
+
+
+def make_api_session() -> requests.Session:
+    """Session for the metadata, aircraft DB and photo requests (with retries)."""
+    return make_session(retries=3)
+
+
+@contextmanager
+def api_session(session: Optional[requests.Session] = None) -> Iterator[requests.Session]:
+    """
+    session as is, or (when None) a make_api_session() that is closed on
+    exit. Callers making many requests should pass their own Session
+    (e.g. from a ThreadSessions they close) to reuse its connections.
+    """
+    if session is not None:
+        yield session
+        return
+    with make_api_session() as own:
+        yield own
+
+
+def trace_cache_path(
+    hex_code: str, day: dt.date, cache_root: Optional[str] = None, gz: bool = True
+) -> str:
+    """
+    Path where fetch_trace_for_day keeps the trace_full JSON for one day.
+    Downloads are stored as served (gzipped, ".json.gz"); gz=False gives the
+    plain ".json" name used by older versions and for uncompressed replies.
+    """
+    ext = ".json.gz" if gz else ".json"
+    if cache_root:
+        return os.path.join(cache_root, hex_code, day.isoformat(), "trace_full" + ext)
+    return os.path.abspath(f"trace_full_{hex_code}_{day}{ext}")
+
+
+def trace_cache_paths(hex_code: str, day: dt.date, cache_root: Optional[str] = None) -> Tuple[str, str]:
+    """(gzipped, plain) trace_cache_path for one day, built with a single join."""
+    plain_path = trace_cache_path(hex_code, day, cache_root, gz=False)
+    return plain_path + ".gz", plain_path
+
+
+def find_cached_trace(hex_code: str, day: dt.date, cache_root: Optional[str] = None) -> Optional[str]:
+    """Existing cached trace file for one day (gzipped or plain), or None."""
+    return next(filter(os.path.exists, trace_cache_paths(hex_code, day, cache_root)), None)
+
+
+def save_trace_response(
+    r: requests.Response,
+    gz_path: str,
+    plain_path: str,
+    stop: Optional[threading.Event] = None,
+) -> Tuple[Optional[str], int]:
+    """
+    Stream a trace download to disk without decompressing it.
+
+    ADSBx serves the trace files gzipped; the bytes are written exactly as
+    received and kept as gz_path. A reply that turns out not to be gzip is
+    kept as plain_path instead. Returns (path, bytes written); path is None
+    if stop was set before the download finished. Partial files are removed.
+    """
+    encoding = r.headers.get("Content-Encoding", "").lower()
+    decode = encoding not in ("", "gzip", "identity")  # e.g. br: let urllib3 undo it
+    tmp_path = gz_path + ".part"
+    size = 0
+    magic = b""
+    stopped = False
+    try:
+        with open(tmp_path, "wb") as f:
+            for chunk in r.raw.stream(1 << 16, decode_content=decode):
+                if stop is not None and stop.is_set():
+                    stopped = True
+                    break
+                if len(magic) < 2:
+                    magic = (magic + chunk)[:2]
+                f.write(chunk)
+                size += len(chunk)
+    except BaseException:
+        with suppress(FileNotFoundError):  # open() itself may have failed
+            os.remove(tmp_path)
+        raise
+    if stopped:
+        os.remove(tmp_path)
+        return None, size
+    path = gz_path if magic == b"\x1f\x8b" else plain_path
+    os.replace(tmp_path, path)
+    return path, size
+
+
+def trace_needs_revalidation(day: dt.date, today: Optional[dt.date] = None) -> bool:
+    """
+    True for days whose trace may still grow on ADSBx (today and yesterday,
+    UTC); their cached copy is re-checked with a conditional GET. Older
+    cached days are used as they are. Pass today (UTC) when checking many
+    days in a row.
+    """
+    if today is None:
+        today = dt.datetime.now(dt.timezone.utc).date()
+    return day > today - dt.timedelta(days=TRACE_REVALIDATE_DAYS)
+
+
+# Sidecar files next to a cached trace: (extension, response header, request header)
+_VALIDATORS = (
+    (".etag", "ETag", "If-None-Match"),
+    (".lastmod", "Last-Modified", "If-Modified-Since"),
+)
+
+
+def conditional_headers(path: str) -> Dict[str, str]:
+    """If-None-Match / If-Modified-Since for a cached trace, from its sidecars."""
+    headers: Dict[str, str] = {}
+    for ext, _, request_header in _VALIDATORS:
+        try:
+            with open(path + ext, "r", encoding="utf-8") as f:
+                value = f.read().strip()
+        except OSError:
+            continue
+        if value:
+            headers[request_header] = value
+    return headers
+
+
+def save_validators(path: str, response_headers) -> None:
+    """Store ETag / Last-Modified of a download next to the saved trace."""
+    for ext, response_header, _ in _VALIDATORS:
+        value = response_headers.get(response_header)
+        try:
+            if value:
+                with open(path + ext, "w", encoding="utf-8") as f:
+                    f.write(value)
+            elif os.path.exists(path + ext):
+                os.remove(path + ext)
+        except OSError:
+            pass
+
+
+def trace_url_formatter(hex_code: str) -> Callable[..., str]:
+    """
+    BASE with the aircraft's hex and suffix already filled in; call the
+    result with y=, m=, d= to get one day's trace URL.
+    """
+    return BASE.replace("{suffix}", hex_code[-2:]).replace("{hex}", hex_code).format
+
+
 def fetch_trace_for_day(
     hex_code: str,
     day: dt.date,
@@ -561,58 +1132,103 @@ def fetch_trace_for_day(
     log_cb,
     cache_root: Optional[str] = None,
     retry_wait: int = 30,
+    limiter: Optional[RateLimiter] = None,
+    make_url: Optional[Callable[..., str]] = None,
+    stop: Optional[threading.Event] = None,
 ) -> Optional[str]:
     """
     Download (or use cached) trace_full JSON for a single day.
-    Returns path to JSON file or None.
-    """
-    suffix = hex_code[-2:]
-    url = BASE.format(y=day.year, m=day.month, d=day.day, suffix=suffix, hex=hex_code)
+    Returns path to the (usually gzipped) JSON file or None.
 
-    if cache_root:
-        daily_dir = os.path.join(
-            cache_root,
-            hex_code,
-            f"{day.year:04d}-{day.month:02d}-{day.day:02d}",
-        )
-        os.makedirs(daily_dir, exist_ok=True)
-        json_path = os.path.join(daily_dir, "trace_full.json")
-    else:
-        json_path = os.path.abspath(f"trace_full_{hex_code}_{day}.json")
+    Safe to call from several threads at once when they share a limiter;
+    without one, falls back to a fixed 2s delay per download. Callers
+    fetching many days can pass make_url from trace_url_formatter. Once
+    stop is set, waits and streaming downloads are cut short and the
+    cached copy (if any) is returned.
 
-    if os.path.exists(json_path):
+    A cached day is returned as is, unless it is recent enough to still be
+    changing (trace_needs_revalidation); then it is re-requested with the
+    stored ETag / Last-Modified and kept if the server answers 304.
+    """
+    gz_path, plain_path = trace_cache_paths(hex_code, day, cache_root)
+    cached = next(filter(os.path.exists, (gz_path, plain_path)), None)
+    if cached and not trace_needs_revalidation(day):
         log_cb(f"[cache] {day} already downloaded")
-        return json_path
+        return cached
+    headers = {**GZIP_HEADERS, **conditional_headers(cached)} if cached else GZIP_HEADERS
+
+    if make_url is None:
+        make_url = trace_url_formatter(hex_code)
+    url = make_url(y=day.year, m=day.month, d=day.day)
+
+    if cache_root:
+        os.makedirs(os.path.dirname(gz_path), exist_ok=True)
 
-    log_cb(f"[fetch] {day} → {url}")
-    time.sleep(2)  # be kind to ADSBx
+    log_cb(f"[{'recheck' if cached else 'fetch'}] {day} → {url}")
+    if limiter is None:
+        sleep_unless_stopped(2, stop)  # be kind to ADSBx
 
     for attempt in range(6):
+        if limiter is not None:
+            limiter.acquire(stop)
+        if stop is not None and stop.is_set():
+            return cached
         try:
-            r = session.get(url, headers=HEADERS, timeout=30)
+            r = session.get(url, headers=headers, timeout=30, stream=True)
         except Exception as e:
             log_cb(f"[error] {day}: request error {e}, retrying in 5s")
-            time.sleep(5)
+            sleep_unless_stopped(5, stop)
             continue
 
         if r.status_code == 200:
-            with open(json_path, "wb") as f:
-                f.write(r.content)
-            log_cb(f"[ok] {day}: saved {len(r.content)} bytes")
-            return json_path
+            try:
+                saved, size = save_trace_response(r, gz_path, plain_path, stop)
+            except Exception as e:
+                log_cb(f"[error] {day}: download interrupted ({e}), retrying in 5s")
+                sleep_unless_stopped(5, stop)
+                continue
+            finally:
+                r.close()
+            if saved is None:  # stopped mid-download
+                return cached
+            save_validators(saved, r.headers)
+            if cached and cached != saved:
+                # Reply came back in the other format (.json vs .json.gz)
+                stale_files = [cached, parsed_cache_path(cached)]
+                stale_files += [cached + ext for ext, _, _ in _VALIDATORS]
+                for stale in stale_files:
+                    if os.path.exists(stale):
+                        os.remove(stale)
+            log_cb(f"[ok] {day}: saved {size} bytes")
+            return saved
+
+        r.close()  # streamed; release the connection without reading the body
+
+        if r.status_code == 304 and cached:
+            log_cb(f"[cache-hit] 304 {day} unchanged")
+            return cached
 
         if r.status_code == 404:
+            if cached:
+                log_cb(f"[cache] {day}: 404 on re-check, keeping cached copy")
+                return cached
             log_cb(f"[skip] {day}: 404 (no data)")
             return None
 
         if r.status_code == 429:
             log_cb(f"[rate] 429 on {day}, backing off {retry_wait}s")
-            time.sleep(retry_wait)
+            if limiter is not None:
+                limiter.pause(retry_wait)  # all workers back off together
+            else:
+                sleep_unless_stopped(retry_wait, stop)
             continue
 
         log_cb(f"[warn] {day}: HTTP {r.status_code}, retrying in 5s")
-        time.sleep(5)
+        sleep_unless_stopped(5, stop)
 
+    if cached:
+        log_cb(f"[fail] {day}: re-check failed, using cached copy")
+        return cached
     log_cb(f"[fail] {day}: gave up after retries")
     return None
 
@@ -631,6 +1247,7 @@ class AircraftMeta:
     manufacturer: Optional[str] = None
     model: Optional[str] = None
     photo_url: Optional[str] = None
+    photo_bytes: Optional[bytes] = field(default=None, repr=False)  # image at photo_url, if fetched
     country: Optional[str] = None
     flags: Optional[str] = None         # e.g. "Military, LADD"
     callsigns: Optional[List[str]] = None
@@ -647,7 +1264,7 @@ def apply_type_mapping(meta: AircraftMeta):
         code = meta.type.strip().upper()
         meta.type = code
         if not meta.type_name:
-            common = ICAO_TYPE_NAMES.get(code)
+            common = _TYPE_NAMES_BY_CODE.get(code)
             if common:
                 meta.type_name = common
 
@@ -660,7 +1277,69 @@ def apply_type_mapping(meta: AircraftMeta):
             meta.type_name = meta.description
 
 
-def fetch_opensky_metadata(icao_hex: str, timeout: int = 15) -> AircraftMeta:
+def fetch_metadata_json(
+    source: str,
+    icao_hex: str,
+    url: str,
+    timeout: int,
+    cache_dir: Optional[str] = None,
+    session: Optional[requests.Session] = None,
+) -> Optional[Any]:
+    """
+    GET a per-aircraft metadata API answer (OpenSky, Planespotters), cached.
+
+    Answers are memoized in memory and, if cache_dir is given, kept on disk
+    as {hex}.{source}.json; both copies are reused for METADATA_TTL seconds
+    from the time the answer was fetched. A 404 is cached as
+    {} (no record). Returns None if the lookup failed; request errors raise.
+    Requests go through session (a one-off api_session() if not given).
+    """
+    key = (source, icao_hex.lower(), cache_dir)
+    now = time.time()
+    memo = _METADATA_MEMO.get(key)
+    if memo is not None and now - memo[0] < METADATA_TTL:
+        return memo[1]
+
+    path = os.path.join(cache_dir, f"{key[1]}.{source}.json") if cache_dir else None
+    if path:
+        try:
+            fetched_at = os.path.getmtime(path)
+            if now - fetched_at < METADATA_TTL:
+                with open(path, "rb") as f:
+                    data = json_loads(f.read())
+                _METADATA_MEMO[key] = (fetched_at, data)
+                return data
+        except (OSError, ValueError):
+            pass
+
+    with api_session(session) as s:
+        r = s.get(url, timeout=timeout)
+    if r.status_code == 200:
+        data = json_loads(r.content) or {}  # bytes straight to the parser
+    elif r.status_code == 404:
+        data = {}
+    else:
+        return None
+
+    _METADATA_MEMO[key] = (now, data)
+    if path:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+    return data
+
+
+def fetch_opensky_metadata(
+    icao_hex: str,
+    timeout: int = 15,
+    cache_dir: Optional[str] = None,
+    session: Optional[requests.Session] = None,
+) -> AircraftMeta:
     """
     Query OpenSky aircraft metadata API for registration/manufacturer/model/owner.
     Always returns an AircraftMeta (never None).
@@ -668,9 +1347,8 @@ def fetch_opensky_metadata(icao_hex: str, timeout: int = 15) -> AircraftMeta:
     meta = AircraftMeta(hex=icao_hex)
     try:
         url = f"https://opensky-network.org/api/metadata/aircraft/icao24/{icao_hex.lower()}"
-        r = requests.get(url, timeout=timeout)
-        if r.status_code == 200:
-            data = r.json() or {}
+        data = fetch_metadata_json("opensky", icao_hex, url, timeout, cache_dir, session)
+        if data:
             meta.registration = data.get("registration") or None
             meta.manufacturer = data.get("manufacturerName") or None
             meta.model = data.get("model") or None
@@ -686,13 +1364,17 @@ def fetch_opensky_metadata(icao_hex: str, timeout: int = 15) -> AircraftMeta:
     return meta
 
 
-def fetch_planespotters_photo_and_reg(icao_hex: str, timeout: int = 15) -> (Optional[str], Optional[str]):
+def fetch_planespotters_photo_and_reg(
+    icao_hex: str,
+    timeout: int = 15,
+    cache_dir: Optional[str] = None,
+    session: Optional[requests.Session] = None,
+) -> (Optional[str], Optional[str]):
     """Query Planespotters public API for a representative photo and (maybe) registration."""
     try:
         url = f"https://api.planespotters.net/pub/photos/hex/{icao_hex.lower()}"
-        r = requests.get(url, timeout=timeout)
-        if r.status_code == 200:
-            data = r.json() or {}
+        data = fetch_metadata_json("planespotters", icao_hex, url, timeout, cache_dir, session)
+        if data:
             photos = data.get("photos") or []
             if photos:
                 ph = photos[0]
@@ -705,100 +1387,247 @@ def fetch_planespotters_photo_and_reg(icao_hex: str, timeout: int = 15) -> (Opti
     return None, None
 
 
-def load_adsbx_acdb(cache_root: str, log_cb) -> Any:
+def fetch_photo_bytes(
+    url: str, timeout: int = 20, session: Optional[requests.Session] = None
+) -> Optional[bytes]:
+    """Download an aircraft photo; None on any failure."""
+    try:
+        with api_session(session) as s:
+            r = s.get(url, timeout=timeout)
+        if r.status_code == 200 and r.content:
+            return r.content
+    except Exception:
+        pass
+    return None
+
+
+def load_adsbx_acdb(cache_root: str, log_cb, session: Optional[requests.Session] = None) -> Any:
     """
-    Load the ADSBexchange basic aircraft DB from cache or download it.
-    If anything goes wrong, log and return {} (non-fatal).
+    Load the ADSBexchange basic aircraft DB from cache or download it
+    (through session, a one-off api_session() if not given).
+
+    The downloaded DB is converted once into an indexed SQLite file
+    (see build_acdb_sqlite); later runs open that file directly instead of
+    re-parsing the JSON. Returns a handle for find_acdb_record: the SQLite
+    path, an in-memory hex index if SQLite could not be written, or {}
+    if anything goes wrong (logged, non-fatal).
     """
-    global _ACDB_CACHE
+    global _ACDB_CACHE, _ACDB_INDEX
     if _ACDB_CACHE is not None:
         return _ACDB_CACHE
 
     try:
         os.makedirs(cache_root, exist_ok=True)
         gz_path = os.path.join(cache_root, "basic-ac-db.json.gz")
-        json_path = os.path.join(cache_root, "basic-ac-db.json")
+        sqlite_path = os.path.join(cache_root, "basic-ac-db.sqlite")
 
-        # Prefer plain JSON cache if present
-        if os.path.exists(json_path):
+        # Prefer SQLite cache if present
+        if os.path.exists(sqlite_path):
             try:
-                with open(json_path, "r", encoding="utf-8") as f:
-                    db = json.load(f)
-                log_cb("[acdb] Loaded cached aircraft DB JSON")
-                _ACDB_CACHE = db
-                return db
+                with closing(sqlite3.connect(sqlite_path)) as conn:
+                    conn.execute("SELECT 1 FROM aircraft LIMIT 1").fetchone()
+                log_cb("[acdb] Using cached aircraft DB (SQLite)")
+                _ACDB_CACHE = sqlite_path
+                return _ACDB_CACHE
             except Exception as e:
-                log_cb(f"[acdb] Failed to read cached JSON ({e}), will re-download")
+                log_cb(f"[acdb] Failed to open SQLite cache ({e}), will rebuild")
 
         # If gz already present, try that
         if os.path.exists(gz_path):
             log_cb("[acdb] Using cached gzipped DB")
-            with open(gz_path, "rb") as f:
-                content = f.read()
         else:
             log_cb("[acdb] Downloading aircraft database from ADSBexchange…")
-            r = requests.get(AC_DB_URL, timeout=120)
-            r.raise_for_status()
-            content = r.content
-            with open(gz_path, "wb") as f:
-                f.write(content)
+            with api_session(session) as s, s.get(AC_DB_URL, timeout=120, stream=True) as r:
+                r.raise_for_status()
+                tmp_path = gz_path + ".part"
+                with open(tmp_path, "wb") as f:
+                    for chunk in r.iter_content(1 << 20):
+                        f.write(chunk)
+            os.replace(tmp_path, gz_path)
 
         try:
-            decompressed = gzip.decompress(content).decode("utf-8", errors="ignore")
-        except Exception:
-            decompressed = content.decode("utf-8", errors="ignore")
-
-        try:
-            db = json.loads(decompressed)
+            # Parsed straight from the (gunzipped) byte stream: no full-size
+            # decompressed copy or str decode of the DB is kept around
+            with _open_trace(gz_path) as fp:
+                records = parse_acdb_records(fp)
         except Exception as e:
             log_cb(f"[acdb] JSON decode failed ({e}); ignoring DB.")
-            _ACDB_CACHE = {}
+            _ACDB_CACHE = _ACDB_INDEX = {}
             return _ACDB_CACHE
 
-        _ACDB_CACHE = db
-
-        # Also write plain JSON cache
         try:
-            with open(json_path, "w", encoding="utf-8") as f:
-                json.dump(db, f)
-            log_cb("[acdb] Saved decompressed DB to JSON cache")
+            count = build_acdb_sqlite(records, sqlite_path)
+            log_cb(f"[acdb] Saved {count} aircraft to SQLite cache")
+            _ACDB_CACHE = sqlite_path
         except Exception as e:
-            log_cb(f"[acdb] Warning: failed to write JSON cache ({e})")
+            log_cb(f"[acdb] Warning: failed to write SQLite cache ({e}); using in-memory index")
+            _ACDB_CACHE = _ACDB_INDEX = build_acdb_index(records)
 
-        return db
+        return _ACDB_CACHE
 
     except Exception as e:
         log_cb(f"[acdb] Fatal error loading DB ({e}); continuing without DB.")
-        _ACDB_CACHE = {}
+        _ACDB_CACHE = _ACDB_INDEX = {}
         return _ACDB_CACHE
 
 
-def find_acdb_record(db: Any, icao_hex: str) -> Optional[dict]:
-    """Look up a single ICAO hex record in ADSBx basic aircraft DB."""
-    icao_hex = icao_hex.lower()
-    if not db:
+def parse_acdb_records(fp) -> List[Any]:
+    """
+    Records of the ADSBx DB, read from a binary file object. The DB is
+    normally newline-delimited JSON, parsed line by line from the stream;
+    a single JSON document (list, or dict of records) is parsed whole.
+    When the first line is not a recognizable record, the whole document
+    is tried first, then line by line if that is not valid JSON.
+    """
+    first = fp.readline()
+    while first and not first.strip():
+        first = fp.readline()
+    try:
+        rec = json_loads(first)
+    except ValueError:
+        rec = None
+    records: List[Any] = []
+    lines: Iterable[bytes] = fp
+    if _acdb_record_hex(rec) is not None:
+        records.append(rec)
+    else:
+        rest = fp.read()
+        try:
+            db = json_loads(first + rest)
+        except ValueError:
+            lines = itertools.chain([first], rest.splitlines())
+        else:
+            if isinstance(db, dict):
+                return list(db.values())
+            return db if isinstance(db, list) else []
+
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            records.append(json_loads(line))
+        except ValueError:
+            # the DB used to be read with errors="ignore"; keep tolerating stray bytes
+            records.append(json.loads(line.decode("utf-8", errors="ignore")))
+    return records
+
+
+def _acdb_record_hex(rec: Any) -> Optional[str]:
+    """ICAO hex of an ADSBx DB record (lowercase), or None."""
+    if not isinstance(rec, dict):
+        return None
+    icao_field = (
+        rec.get("ICAO")
+        or rec.get("icao")
+        or rec.get("icao24")
+        or rec.get("ICAO24")
+        or rec.get("hex")
+    )
+    if not isinstance(icao_field, str):
         return None
+    return icao_field.lower()
+
+
+def build_acdb_index(db: Any) -> Dict[str, dict]:
+    """
+    Build a lowercase hex → record index over an ADSBx DB (list or dict).
+    A dict that is already keyed by its records' hex is returned as-is.
+    The first record wins when a hex appears more than once.
+    """
+    if not db:
+        return {}
 
     if isinstance(db, dict):
+        sample = itertools.islice(db.items(), 16)
+        if all(k == _acdb_record_hex(rec) for k, rec in sample):
+            return db
         iterable = db.values()
     else:
         iterable = db
 
+    index: Dict[str, dict] = {}
     for rec in iterable:
-        if not isinstance(rec, dict):
+        key = _acdb_record_hex(rec)
+        if key is not None and key not in index:
+            index[key] = rec
+    return index
+
+
+def _acdb_sqlite_rows(records: Iterable[Any]) -> Iterator[tuple]:
+    """(hex, reg, type, owner, flags, raw) rows for the aircraft table."""
+    for rec in records:
+        key = _acdb_record_hex(rec)
+        if key is None:
             continue
-        icao_field = (
-            rec.get("ICAO")
-            or rec.get("icao")
-            or rec.get("icao24")
-            or rec.get("ICAO24")
-            or rec.get("hex")
+        lower = {k.lower(): v for k, v in rec.items()}
+
+        def first(*keys):
+            for k in keys:
+                v = lower.get(k)
+                if v not in (None, ""):
+                    return str(v)
+            return None
+
+        dbf = lower.get("dbflags")
+        yield (
+            key,
+            first("reg", "r", "registration", "tail"),
+            first("icaotype", "t", "type"),
+            first("ownop", "owner", "operator", "op"),
+            flags_from_dbflags(dbf) if dbf is not None else None,
+            json.dumps(rec, ensure_ascii=False),
         )
-        if not isinstance(icao_field, str):
-            continue
-        if icao_field.lower() == icao_hex:
-            return rec
-    return None
+
+
+def build_acdb_sqlite(records: Iterable[Any], sqlite_path: str) -> int:
+    """
+    Write ADSBx DB records into an SQLite table
+    aircraft(hex PRIMARY KEY, reg, type, owner, flags, raw) in one
+    transaction, keeping the first record per hex. The file is built under
+    a temporary name and then moved into place, so a half-written DB is
+    never picked up as a cache. Returns the number of rows written.
+    """
+    tmp_path = sqlite_path + ".tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    with closing(sqlite3.connect(tmp_path)) as conn:
+        # Throwaway file until the final rename: no journal, no fsyncs
+        conn.execute("PRAGMA journal_mode=OFF")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute(
+            "CREATE TABLE aircraft ("
+            "hex TEXT PRIMARY KEY, reg TEXT, type TEXT, owner TEXT, flags TEXT, raw BLOB)"
+        )
+        with conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO aircraft VALUES (?, ?, ?, ?, ?, ?)",
+                _acdb_sqlite_rows(records),
+            )
+        count = conn.execute("SELECT COUNT(*) FROM aircraft").fetchone()[0]
+
+    os.replace(tmp_path, sqlite_path)
+    return count
+
+
+def find_acdb_record(db: Any, icao_hex: str) -> Optional[dict]:
+    """
+    Look up a single ICAO hex record in ADSBx basic aircraft DB.
+    db is what load_adsbx_acdb returned (SQLite path or hex index), or a
+    raw list/dict of records.
+    """
+    if not db:
+        return None
+
+    if isinstance(db, str):
+        with closing(sqlite3.connect(db)) as conn:
+            row = conn.execute(
+                "SELECT raw FROM aircraft WHERE hex = ?", (icao_hex.lower(),)
+            ).fetchone()
+        return json_loads(row[0]) if row else None
+
+    index = db if db is _ACDB_INDEX else build_acdb_index(db)
+    return index.get(icao_hex.lower())
 
 
 def flags_from_dbflags(dbflags: Any) -> Optional[str]:
@@ -943,6 +1772,27 @@ def merge_trace_blob_into_meta(blob: Any, meta: AircraftMeta):
             meta.callsigns.append(cs)
 
 
+# Lowercased ac_data keys that enrich_meta_from_hits reads, in priority order
+_REG_KEYS = ("r", "reg", "registration", "tail", "tailnum", "tail_num")
+_TYPE_KEYS = ("t", "type", "icaotype", "icao_type")
+_OWNER_KEYS = ("owner", "op", "operator", "ownop")
+_MIL_KEYS = ("mil", "military")
+_CALLSIGN_KEYS = ("call", "callsign", "cs", "flight")
+_ENRICH_KEYS = frozenset(
+    _REG_KEYS + _TYPE_KEYS + _OWNER_KEYS + _MIL_KEYS + _CALLSIGN_KEYS + ("dbflags",)
+)
+_CALLSIGN_KEY_SET = frozenset(_CALLSIGN_KEYS)
+
+
+def _first_str(fields: Dict[str, Any], keys: Tuple[str, ...]) -> Optional[str]:
+    """First non-blank string among fields[k] for k in keys (stripped)."""
+    for k in keys:
+        v = fields.get(k)
+        if isinstance(v, str) and v.strip():
+            return v.strip()
+    return None
+
+
 def enrich_meta_from_hits(meta: AircraftMeta, segments: List[List[Dict[str, Any]]]):
     """
     Look into ac_data inside hits to extract:
@@ -951,8 +1801,16 @@ def enrich_meta_from_hits(meta: AircraftMeta, segments: List[List[Dict[str, Any]
       - owner
       - flags (military etc.)
       - callsigns
+
+    Keys are matched case-insensitively. Which keys of an ac_data dict are
+    of interest is worked out once per distinct key layout (hits of a trace
+    share a handful); once all meta fields are set, only callsign keys are
+    still collected.
     """
-    callsigns: Set[str] = set(meta.callsigns or [])
+    callsigns: Dict[str, None] = dict.fromkeys(meta.callsigns or ())  # ordered set
+    want = _ENRICH_KEYS
+    # key tuple of an ac_data dict → ((lowercased, original key), ...) for wanted keys
+    projections: Dict[Tuple[str, ...], Tuple[Tuple[str, str], ...]] = {}
 
     for seg in segments:
         for hit in seg:
@@ -960,55 +1818,57 @@ def enrich_meta_from_hits(meta: AircraftMeta, segments: List[List[Dict[str, Any]
             if not isinstance(ac, dict):
                 continue
 
-            lower_map = {k.lower(): k for k in ac.keys()}
-
-            def get_ci(*keys):
-                for k in keys:
-                    real = lower_map.get(k.lower())
-                    if real is not None:
-                        v = ac.get(real)
-                        if isinstance(v, str) and v.strip():
-                            return v.strip()
-                return None
-
-            if not meta.registration:
-                reg = get_ci("r", "reg", "registration", "tail", "tailnum", "tail_num")
-                if reg:
-                    meta.registration = reg
-
-            if not meta.type:
-                t = get_ci("t", "type", "icaoType", "icao_type")
-                if t:
-                    meta.type = t
-
-            if not meta.owner:
-                owner = get_ci("owner", "Owner", "op", "operator", "OWNOP")
-                if owner:
-                    meta.owner = owner
-
-            if not meta.flags:
-                dbf_key = lower_map.get("dbflags")
-                dbf = ac.get(dbf_key) if dbf_key else None
-                f = flags_from_dbflags(dbf) if dbf is not None else None
-                if not f:
-                    mil = get_ci("MIL", "mil", "military")
-                    if mil:
-                        f = f"Military={mil}"
-                if f:
-                    meta.flags = f
-
-            for k in ("call", "callsign", "cs", "flight"):
-                real = lower_map.get(k.lower())
-                if real is None:
-                    continue
-                v = ac.get(real)
+            keys = tuple(ac)
+            proj = projections.get(keys)
+            if proj is None:
+                # a later key wins when two differ only by case
+                lowered = {k.lower(): k for k in keys}
+                proj = projections[keys] = tuple(
+                    (kl, k) for kl, k in lowered.items() if kl in want
+                )
+            if not proj:
+                continue
+            fields = {kl: ac[k] for kl, k in proj}
+
+            if want is _ENRICH_KEYS:
+                if not meta.registration:
+                    reg = _first_str(fields, _REG_KEYS)
+                    if reg:
+                        meta.registration = reg
+
+                if not meta.type:
+                    t = _first_str(fields, _TYPE_KEYS)
+                    if t:
+                        meta.type = t
+
+                if not meta.owner:
+                    owner = _first_str(fields, _OWNER_KEYS)
+                    if owner:
+                        meta.owner = owner
+
+                if not meta.flags:
+                    dbf = fields.get("dbflags")
+                    f = flags_from_dbflags(dbf) if dbf is not None else None
+                    if not f:
+                        mil = _first_str(fields, _MIL_KEYS)
+                        if mil:
+                            f = f"Military={mil}"
+                    if f:
+                        meta.flags = f
+
+                if meta.registration and meta.type and meta.owner and meta.flags:
+                    want = _CALLSIGN_KEY_SET
+                    projections.clear()
+
+            for k in _CALLSIGN_KEYS:
+                v = fields.get(k)
                 if isinstance(v, str):
                     v = v.strip()
                     if v:
-                        callsigns.add(v)
+                        callsigns[v] = None
 
     if callsigns:
-        meta.callsigns = sorted(callsigns)
+        meta.callsigns = list(callsigns)  # first-seen order; the UI sorts for display
 
 
 # -----------------------------
@@ -1016,7 +1876,7 @@ def enrich_meta_from_hits(meta: AircraftMeta, segments: List[List[Dict[str, Any]
 # -----------------------------
 
 class Worker(QtCore.QThread):
-    progress = QtCore.pyqtSignal(str)
+    progress = QtCore.pyqtSignal(str)  # one or more log lines, newline-separated
     card_update = QtCore.pyqtSignal(object)  # AircraftMeta
     finished_ok = QtCore.pyqtSignal()
     finished_err = QtCore.pyqtSignal(str)
@@ -1039,42 +1899,129 @@ class Worker(QtCore.QThread):
         self.do_csv = do_csv
         self.do_json = do_json
         self.out_dir = out_dir
-        self._stop = False
+        self._stop_evt = threading.Event()
+        self._last_type_inputs = None  # meta fields apply_type_mapping last saw
+        self._last_card_sig = None  # card fields at the last card_update emit
+
+        # Log lines are buffered and handed to the UI in batches every
+        # LOG_FLUSH_MS; the timer lives in the GUI thread.
+        self._log_lock = threading.Lock()
+        self._log_buf: List[str] = []
+        self._log_timer = QtCore.QTimer(self)
+        self._log_timer.setInterval(LOG_FLUSH_MS)
+        self._log_timer.timeout.connect(self.flush_log)
+        self.started.connect(self._log_timer.start)
+        self.finished.connect(self._log_timer.stop)
 
     def stop(self):
-        self._stop = True
+        self._stop_evt.set()
 
     def log(self, msg: str):
-        self.progress.emit(msg)
+        """Queue a log line; safe to call from any thread."""
+        with self._log_lock:
+            self._log_buf.append(msg)
+
+    def flush_log(self):
+        """Emit all buffered log lines as one progress signal."""
+        # Emitting under the lock keeps batches in order between the timer
+        # (GUI thread) and the final flush from the worker thread.
+        with self._log_lock:
+            if self._log_buf:
+                batch, self._log_buf = self._log_buf, []
+                self.progress.emit("\n".join(batch))
+
+    def _finish(self, error: Optional[str] = None):
+        """Flush the log, then emit finished_ok or finished_err(error)."""
+        self.flush_log()
+        if error is None:
+            self.finished_ok.emit()
+        else:
+            self.finished_err.emit(error)
+
+    def _update_card(self, m: AircraftMeta):
+        """
+        apply_type_mapping + card_update, each skipped when the fields it
+        depends on are unchanged since the previous call.
+        """
+        type_inputs = (m.type, m.type_name, m.manufacturer, m.model, m.description)
+        if type_inputs != self._last_type_inputs:
+            apply_type_mapping(m)
+            self._last_type_inputs = (m.type, m.type_name, m.manufacturer, m.model, m.description)
+
+        sig = (
+            m.hex,
+            m.type,
+            m.type_name,
+            m.registration,
+            m.owner,
+            m.flags,
+            tuple(m.callsigns or ()),
+            m.photo_url,
+        )
+        if sig != self._last_card_sig:
+            self._last_card_sig = sig
+            self.card_update.emit(m)
 
     def run(self):
         try:
             # 1) Start with just hex
             meta_obj = AircraftMeta(hex=self.icao_hex)
 
-            # 2) External metadata (best effort, non-fatal)
+            # 2) External metadata (best effort, non-fatal). The three sources
+            #    are independent, so they are queried concurrently; results
+            #    are merged in a fixed order, which sets their precedence.
+            cache_root = os.path.join(self.out_dir, "cache")
+            meta_cache = os.path.join(cache_root, "metadata")
+            acdb_root = os.path.join(self.out_dir, "acdb_cache")
+            meta_sessions = ThreadSessions(make_api_session)  # closed once the lookups are done
+
+            def lookup_opensky():
+                return fetch_opensky_metadata(
+                    self.icao_hex, cache_dir=meta_cache, session=meta_sessions.get()
+                )
+
+            def lookup_photo():
+                session = meta_sessions.get()
+                photo_url, reg2 = fetch_planespotters_photo_and_reg(
+                    self.icao_hex, cache_dir=meta_cache, session=session
+                )
+                # Photo fetched here, off the GUI thread; the card only decodes it
+                photo_bytes = fetch_photo_bytes(photo_url, session=session) if photo_url else None
+                return photo_url, reg2, photo_bytes
+
+            def lookup_acdb():
+                db = load_adsbx_acdb(acdb_root, self.log, session=meta_sessions.get())
+                return find_acdb_record(db, self.icao_hex)
+
+            try:
+                with ThreadPoolExecutor(max_workers=3) as ex:
+                    f_opensky = ex.submit(lookup_opensky)
+                    f_photo = ex.submit(lookup_photo)
+                    f_acdb = ex.submit(lookup_acdb)
+            finally:
+                meta_sessions.close()
+
             try:
-                os_meta = fetch_opensky_metadata(self.icao_hex)
-                for field in ("registration", "manufacturer", "model", "owner", "type"):
-                    v = getattr(os_meta, field, None)
-                    if v and not getattr(meta_obj, field):
-                        setattr(meta_obj, field, v)
+                os_meta = f_opensky.result()
+                for attr in ("registration", "manufacturer", "model", "owner", "type"):
+                    v = getattr(os_meta, attr, None)
+                    if v and not getattr(meta_obj, attr):
+                        setattr(meta_obj, attr, v)
             except Exception as e:
                 self.log(f"[meta] OpenSky error: {e}")
 
             try:
-                photo_url, reg2 = fetch_planespotters_photo_and_reg(self.icao_hex)
+                photo_url, reg2, photo_bytes = f_photo.result()
                 if photo_url:
                     meta_obj.photo_url = photo_url
+                    meta_obj.photo_bytes = photo_bytes
                 if reg2 and not meta_obj.registration:
                     meta_obj.registration = reg2
             except Exception as e:
                 self.log(f"[meta] Planespotters error: {e}")
 
             try:
-                acdb_root = os.path.join(self.out_dir, "acdb_cache")
-                db = load_adsbx_acdb(acdb_root, self.log)
-                rec = find_acdb_record(db, self.icao_hex)
+                rec = f_acdb.result()
                 if rec:
                     self.log("[acdb] Found record in ADSBx DB")
                     merge_adsbx_record_into_meta(rec, meta_obj)
@@ -1083,64 +2030,110 @@ class Worker(QtCore.QThread):
             except Exception as e:
                 self.log(f"[acdb] Error loading/merging DB: {e}")
 
-            # Normalize type code & friendly name
-            apply_type_mapping(meta_obj)
+            # Normalize type code & friendly name, emit initial card
+            self._update_card(meta_obj)
 
-            # Emit initial card
-            self.card_update.emit(meta_obj)
-
-            session = requests.Session()
+            limiter = RateLimiter(FETCH_RATE_PER_SEC)
+            days = list(daterange(self.start_date, self.end_date))
+            paths: Dict[dt.date, Optional[str]] = {}
             all_segments: List[List[Dict[str, Any]]] = []
+            total_points = 0  # running total, kept as days are parsed
+
+            # 3) Fetch all days (parallel, globally rate limited). Cached
+            #    days are resolved here, so threads only go to downloads and
+            #    conditional re-checks of recent days; those already parsed
+            #    on an earlier run are loaded straight from the parsed cache.
+            to_fetch: List[dt.date] = []
+            today = dt.datetime.now(dt.timezone.utc).date()
+            for day in days:
+                cached = find_cached_trace(self.icao_hex, day, cache_root)
+                if cached and not trace_needs_revalidation(day, today):
+                    day_iso = day.isoformat()
+                    if has_fresh_parsed_cache(cached):
+                        self.log(f"[cache] hit {day_iso}")
+                    else:
+                        self.log(f"[cache] {day_iso} already downloaded")
+                    paths[day] = cached
+                else:
+                    to_fetch.append(day)
+
+            if to_fetch:
+                make_url = trace_url_formatter(self.icao_hex)
+                sessions = ThreadSessions()
+
+                def fetch_day(day: dt.date) -> Optional[str]:
+                    return fetch_trace_for_day(
+                        self.icao_hex,
+                        day,
+                        sessions.get(),
+                        self.log,
+                        cache_root=cache_root,
+                        limiter=limiter,
+                        make_url=make_url,
+                        stop=self._stop_evt,
+                    )
 
-            # 3) Fetch all days
-            for day in daterange(self.start_date, self.end_date):
-                if self._stop:
+                try:
+                    with ThreadPoolExecutor(max_workers=min(FETCH_WORKERS, len(to_fetch))) as ex:
+                        futures = {ex.submit(fetch_day, day): day for day in to_fetch}
+                        for fut in as_completed(futures):
+                            if self._stop_evt.is_set():
+                                # Cancel what has not started; leaving the with
+                                # block waits for running fetches (cut short by
+                                # the stop event), so their log lines land
+                                # before the parse loop below reports the stop.
+                                for pending in futures:
+                                    pending.cancel()
+                                break
+                            day = futures[fut]
+                            try:
+                                paths[day] = fut.result()
+                            except Exception as e:
+                                self.log(f"[error] fetch {day}: {e}")
+                                paths[day] = None
+                finally:
+                    sessions.close()
+
+            # 4) Parse days in calendar order
+            for day in days:
+                if self._stop_evt.is_set():
                     self.log("[stop] Stopping as requested.")
-                    self.finished_err.emit("Stopped")
+                    self._finish("Stopped")
                     return
 
-                self.log(f"[day] {day}")
-                cache_root = os.path.join(self.out_dir, "cache")
-                path = fetch_trace_for_day(
-                    self.icao_hex, day, session, self.log, cache_root=cache_root
-                )
+                path = paths.get(day)
                 if not path:
                     continue
+                day_iso = day.isoformat()
+                self.log(f"[day] {day_iso}")
 
                 try:
-                    with open(path, "rb") as f:
-                        raw = f.read()
-                    try:
-                        blob = json.loads(raw)
-                    except json.JSONDecodeError:
-                        blob = json.loads(gzip.GzipFile(fileobj=io.BytesIO(raw)).read())
+                    header, segments = load_trace_day_cached(path)
                 except Exception as e:
-                    self.log(f"[error] parse {day}: {e}")
+                    self.log(f"[error] parse {day_iso}: {e}")
                     continue
 
-                merge_trace_blob_into_meta(blob, meta_obj)
-                apply_type_mapping(meta_obj)
-                self.card_update.emit(meta_obj)
+                merge_trace_blob_into_meta(header, meta_obj)
+                self._update_card(meta_obj)
 
-                segments = extract_hits(blob)
                 if segments:
                     all_segments.extend(segments)
-                    total_pts = sum(len(seg) for seg in segments)
-                    self.log(f"[points] {day}: {total_pts} points in {len(segments)} segment(s)")
+                    day_points = sum(map(len, segments))
+                    total_points += day_points
+                    self.log(f"[points] {day_iso}: {day_points} points in {len(segments)} segment(s)")
                 else:
-                    self.log(f"[points] {day}: no valid points found")
+                    self.log(f"[points] {day_iso}: no valid points found")
 
             if not all_segments:
                 self.log("No points parsed; nothing to write.")
-                self.finished_err.emit("No data")
+                self._finish("No data")
                 return
 
-            # 4) Enrich metadata from hits and callsigns
+            # 5) Enrich metadata from hits and callsigns
             enrich_meta_from_hits(meta_obj, all_segments)
-            apply_type_mapping(meta_obj)
-            self.card_update.emit(meta_obj)
+            self._update_card(meta_obj)
 
-            # 5) Build meta dict for exporters
+            # 6) Build meta dict for exporters
             meta = {
                 "icao": meta_obj.hex.lower(),
                 "registration": meta_obj.registration,
@@ -1163,14 +2156,17 @@ class Worker(QtCore.QThread):
             except Exception:
                 pass
 
-            total_points = sum(len(seg) for seg in all_segments)
             self.log(f"[stats] Total points across all days: {total_points}")
 
+            # ac_data columns are shared by the KML and CSV exports
+            ac_keys = discover_ac_keys(all_segments) if (self.do_kml or self.do_csv) else []
+
             if self.do_kml:
-                kml_path = base_root + ".kml"
+                # Big tracks: zipped KMZ, ~10x smaller and still opens in Google Earth
+                kml_path = base_root + (".kmz" if total_points >= KMZ_MIN_POINTS else ".kml")
                 self.log(f"[kml] Building time-enabled KML at {kml_path}…")
                 try:
-                    build_kml(all_segments, self.icao_hex, meta, kml_path)
+                    build_kml(all_segments, self.icao_hex, meta, kml_path, ac_keys)
                     self.log(f"[kml] Wrote {kml_path}")
                 except Exception as e:
                     self.log(f"[error] KML: {e}")
@@ -1179,7 +2175,7 @@ class Worker(QtCore.QThread):
                 csv_path = base_root + ".csv"
                 self.log(f"[csv] Building CSV at {csv_path}…")
                 try:
-                    build_csv(all_segments, self.icao_hex, meta, csv_path)
+                    build_csv(all_segments, self.icao_hex, meta, csv_path, ac_keys)
                     self.log(f"[csv] Wrote {csv_path}")
                 except Exception as e:
                     self.log(f"[error] CSV: {e}")
@@ -1193,11 +2189,11 @@ class Worker(QtCore.QThread):
                 except Exception as e:
                     self.log(f"[error] JSON: {e}")
 
-            self.finished_ok.emit()
+            self._finish()
 
         except Exception as e:
             self.log(f"[fatal] {e}")
-            self.finished_err.emit(str(e))
+            self._finish(str(e))
 
 
 # -----------------------------
@@ -1224,31 +2220,102 @@ class ToggleCheckBox(QtWidgets.QCheckBox):
             )
 
 
+class HexValidator(QtGui.QRegExpValidator):
+    """
+    Accepts up to 6 hex digits and uppercases them as they are typed, so
+    Qt rejects bad keystrokes itself (no textChanged round-trip).
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(QtCore.QRegExp("[0-9A-Fa-f]{0,6}"), parent)
+
+    def validate(self, text: str, pos: int):
+        state, _, pos = super().validate(text, pos)
+        return state, text.upper(), pos
+
+
+class _ImageSignals(QtCore.QObject):
+    done = QtCore.pyqtSignal(str, bytes)  # url, image data (b"" on failure)
+
+
+class ImageFetchTask(QtCore.QRunnable):
+    """Downloads one image on the global QThreadPool and emits signals.done."""
+
+    def __init__(self, url: str):
+        super().__init__()
+        self.url = url
+        self.signals = _ImageSignals()
+
+    def run(self):
+        # Pool threads come and go (idle ones expire), so each task uses its
+        # own Session and closes it rather than leaving one per thread
+        with make_api_session() as session:
+            data = fetch_photo_bytes(self.url, session=session)
+        self.signals.done.emit(self.url, data or b"")
+
+
 class ImageLabel(QtWidgets.QLabel):
-    def set_remote_image(self, url: Optional[str]):
+    """
+    Shows the aircraft photo. Image data passed in (AircraftMeta.photo_bytes,
+    fetched by the Worker) is only decoded; otherwise it is downloaded off
+    the GUI thread. Scaled pixmaps are cached per URL, so repeated card
+    updates don't refetch.
+    """
+
+    _pixmap_cache: Dict[str, QtGui.QPixmap] = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._current_url: Optional[str] = None
+        self._tasks: Set[ImageFetchTask] = set()  # keep in-flight tasks alive
+
+    def set_remote_image(self, url: Optional[str], data: Optional[bytes] = None):
         if not url:
+            self._current_url = None
             self.setText("No image available")
             self.setAlignment(QtCore.Qt.AlignCenter)
             return
-        try:
-            r = requests.get(url, timeout=20)
-            if r.status_code == 200:
-                pix = QtGui.QPixmap()
-                pix.loadFromData(r.content)
-                if not pix.isNull():
-                    self.setPixmap(
-                        pix.scaled(
-                            420,
-                            280,
-                            QtCore.Qt.KeepAspectRatio,
-                            QtCore.Qt.SmoothTransformation,
-                        )
-                    )
-                    self.setAlignment(QtCore.Qt.AlignCenter)
-                    return
-        except Exception:
-            pass
-        self.setText("Image load failed")
+        if url == self._current_url:
+            return  # already shown or on its way
+        self._current_url = url
+
+        pix = self._pixmap_cache.get(url)
+        if pix is not None:
+            self.setPixmap(pix)
+            self.setAlignment(QtCore.Qt.AlignCenter)
+            return
+        if data:
+            self._on_image_data(url, data)
+            return
+
+        self.setText("Loading image…")
+        self.setAlignment(QtCore.Qt.AlignCenter)
+        task = ImageFetchTask(url)
+        task.signals.done.connect(self._on_image_data)
+        self._tasks.add(task)
+        QtCore.QThreadPool.globalInstance().start(task)
+
+    def _on_image_data(self, url: str, data: bytes):
+        self._tasks = {t for t in self._tasks if t.url != url}
+        pix = QtGui.QPixmap()
+        if data:
+            pix.loadFromData(data)
+        if not pix.isNull():
+            pix = pix.scaled(
+                420,
+                280,
+                QtCore.Qt.KeepAspectRatio,
+                QtCore.Qt.SmoothTransformation,
+            )
+            self._pixmap_cache[url] = pix
+
+        if url != self._current_url:
+            return  # a newer image was requested meanwhile
+        if pix.isNull():
+            self._current_url = None  # let the next card update retry
+            self.setText("Image load failed")
+        else:
+            self.setPixmap(pix)
         self.setAlignment(QtCore.Qt.AlignCenter)
 
 
@@ -1282,7 +2349,7 @@ class MainWindow(QtWidgets.QMainWindow):
 
         self.hex_edit = QtWidgets.QLineEdit()
         self.hex_edit.setPlaceholderText("ICAO HEX (e.g., A1B2C3)")
-        self.hex_edit.textChanged.connect(self._upper_hex)
+        self.hex_edit.setValidator(HexValidator(self.hex_edit))
 
         self.kml_chk = ToggleCheckBox("Export KML")
         self.csv_chk = ToggleCheckBox("Export CSV")
@@ -1412,13 +2479,6 @@ class MainWindow(QtWidgets.QMainWindow):
 
     # --- UI helpers ---
 
-    def _upper_hex(self, s: str):
-        cur = s.upper()
-        if cur != s:
-            pos = self.hex_edit.cursorPosition()
-            self.hex_edit.setText(cur)
-            self.hex_edit.setCursorPosition(pos)
-
     def choose_folder(self):
         folder = QtWidgets.QFileDialog.getExistingDirectory(
             self,
@@ -1445,8 +2505,9 @@ class MainWindow(QtWidgets.QMainWindow):
             subprocess.Popen(["xdg-open", path])
 
     def append_log(self, text: str):
+        # text may be a batch of lines from Worker.flush_log
         self.log.appendPlainText(text)
-        self.status.showMessage(text, 5000)
+        self.status.showMessage(text.rsplit("\n", 1)[-1], 5000)
 
     def on_card_update(self, meta: AircraftMeta):
         self.lbl_type_code.setText(meta.type or "-")
@@ -1455,9 +2516,9 @@ class MainWindow(QtWidgets.QMainWindow):
         self.lbl_reg.setText(meta.registration or "-")
         self.lbl_owner.setText(meta.owner or "-")
         self.lbl_flags.setText(meta.flags or "-")
-        cs_text = ", ".join(meta.callsigns) if meta.callsigns else "-"
+        cs_text = ", ".join(sorted(meta.callsigns)) if meta.callsigns else "-"
         self.lbl_callsigns.setText(cs_text)
-        self.image.set_remote_image(meta.photo_url)
+        self.image.set_remote_image(meta.photo_url, meta.photo_bytes)
 
     # --- Run / Stop ---
 
@@ -1467,9 +2528,9 @@ class MainWindow(QtWidgets.QMainWindow):
             return
 
         hex_code = self.hex_edit.text().strip().upper()
-        if not hex_code or any(c not in "0123456789ABCDEF" for c in hex_code):
+        if not _HEX_RE.fullmatch(hex_code):
             QtWidgets.QMessageBox.warning(
-                self, "Invalid ICAO HEX", "Please enter a valid hex (0-9, A-F)."
+                self, "Invalid ICAO HEX", "Please enter a 6-digit hex (0-9, A-F)."
             )
             return
 